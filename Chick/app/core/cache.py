@@ -0,0 +1,46 @@
+# app/core/cache.py
+"""
+Redis 快取（可選）：沒設 REDIS_URL 或沒裝 redis 套件時全部變成 no-op，
+Redis 掛掉也只會 cache miss，不影響 API。
+"""
+from __future__ import annotations
+
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # 沒裝 redis 就不快取
+    redis = None
+
+redis_client = (
+    redis.Redis.from_url(settings.REDIS_URL, decode_responses=True, socket_timeout=0.2)
+    if redis is not None and settings.REDIS_URL
+    else None
+)
+
+
+def cache_get(key: str) -> str | None:
+    if redis_client is None:
+        return None
+    try:
+        return redis_client.get(key)
+    except redis.RedisError:
+        return None
+
+
+def cache_setex(key: str, ttl_seconds: int, value: str) -> None:
+    if redis_client is None:
+        return
+    try:
+        redis_client.setex(key, ttl_seconds, value)
+    except redis.RedisError:
+        pass
+
+
+def cache_delete(key: str) -> None:
+    if redis_client is None:
+        return
+    try:
+        redis_client.delete(key)
+    except redis.RedisError:
+        pass
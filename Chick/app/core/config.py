@@ -5,12 +5,28 @@ from pydantic import Field
 class Settings(BaseSettings):
     # 讀 .env
     DATABASE_URL: str | None = None
+    # async 版連線字串（例如 mysql+aiomysql://...）；沒填就由 DATABASE_URL 換 driver 推出來
+    ASYNC_DATABASE_URL: str | None = None
+    # 連線池：同步 + async 兩個 pool 加起來就是每個 worker 最多佔用的 MySQL 連線數
+    # （預設 (10+5) + (10+5) = 30；多 worker 時注意別超過 MySQL max_connections）
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_ASYNC_POOL_SIZE: int = 10
+    DB_ASYNC_MAX_OVERFLOW: int = 5
     JWT_SECRET: str = Field(..., description="JWT 簽章密鑰（請放長且隨機的字串）")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 20
     REFRESH_TOKEN_EXPIRE_DAYS: int = 21
     
     GOOGLE_CLIENT_ID: str | None = None  # ✅ 新增
 
+    # 可選：有設才會用 Redis 快取（例如 redis://127.0.0.1:6379/0）
+    REDIS_URL: str | None = None
+
+    # refresh_tokens 背景清理：多 worker 部署時只在「一個」process 設 true
+    RT_GC_ENABLED: bool = False
+    # 啟動後先等多久才第一次清理（避免每次重啟 / reload 都立刻跑一次）
+    RT_GC_INITIAL_DELAY_SECONDS: int = 600
+
     class Config:
         env_file = ".env"
         extra = "ignore"
@@ -1,7 +1,8 @@
 # app/core/security.py
 from __future__ import annotations
+import base64
 import hashlib
-import secrets
+import os
 import time
 from datetime import datetime, timedelta, timezone
 from typing import Tuple
@@ -43,17 +44,19 @@ def create_access_token(
 
 
 # ---- Refresh Token (明文 + 雜湊) ----
-def generate_refresh_token() -> str:
+def generate_refresh_token(nbytes: int = 48) -> str:
     """
     產生高熵的 Refresh Token 明文（只在回應時提供一次）
     """
-    # 43~64字元左右的 URL-safe 隨機字串
-    return secrets.token_urlsafe(48)
+    # 一次 os.urandom（單一 getrandom syscall）+ C 實作的 base64，得到 64 字元 URL-safe 字串
+    return base64.urlsafe_b64encode(os.urandom(nbytes)).rstrip(b"=").decode("ascii")
 
 
 def hash_refresh_token(refresh_token_plain: str) -> str:
     """
     將 Refresh Token 明文轉成雜湊字串（資料庫只存這個）
+    直接用 hashlib.sha256（OpenSSL 實作，CPU 有 SHA-NI 時會走硬體指令）；
+    RT 本身是高熵隨機值，不需要再包 hmac。
     """
     return hashlib.sha256(refresh_token_plain.encode("utf-8")).hexdigest()
 
@@ -28,7 +28,18 @@ class CoinsLedger(Base):
     ref_id = Column(BigInteger, nullable=True)
     idempotency_key = Column(String(64), nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    __table_args__ = (Index("idx_coins_user_created", "user_id", "created_at"),)
+    __table_args__ = (
+        Index("idx_coins_user_created", "user_id", "created_at"),
+        # 冪等：MySQL unique index 允許多筆 NULL，等同只對有值的列生效
+        Index("ix_coins_idem", "user_id", "idempotency_key", unique=True),
+        Index("ix_coins_srcref", "user_id", "source", "ref_id", unique=True),
+    )
+
+class UserCoinBalance(Base):
+    # coins_ledger 的 SUM(delta) 快照，add_ledger_entry 寫入時同一個 transaction 更新
+    __tablename__ = "user_coin_balances"
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    balance = Column(BigInteger, nullable=False, default=0)
 
 class Checkin(Base):
     __tablename__ = "checkins"
@@ -54,7 +65,12 @@ class Checkin(Base):
     reason = Column(String(128), nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=True)
-    __table_args__ = (Index("idx_checkins_user_created", "user_id", "created_at"),)
+    __table_args__ = (
+        Index("idx_checkins_user_created", "user_id", "created_at"),
+        # chicken_status：本週次數（started_at）/ 最近一次運動（ended_at）
+        Index("ix_checkins_user_status_started", "user_id", "status", "started_at"),
+        Index("ix_checkins_user_status_ended", "user_id", "status", "ended_at"),
+    )
 
     # （可選）如果你之後想直接 row.gym 取健身房資料
     gym = relationship("Gym", lazy="joined")
@@ -69,7 +85,11 @@ class Run(Base):
     status = Column(Enum(RunStatus), nullable=False, default=RunStatus.submitted)
     reason = Column(String(128), nullable=True)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    __table_args__ = (Index("idx_runs_user_created", "user_id", "created_at"),)
+    __table_args__ = (
+        Index("idx_runs_user_created", "user_id", "created_at"),
+        # chicken_status：status=awarded 的範圍查詢
+        Index("ix_runs_user_status_created", "user_id", "status", "created_at"),
+    )
 
 class TrainingLog(Base):
     __tablename__ = "training_logs"
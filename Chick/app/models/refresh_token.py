@@ -1,12 +1,9 @@
 # app/models/refresh_token.py
 from datetime import datetime
-from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy import Integer, String, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.db import Base
 
-def utcnow_naive():
-    return datetime.utcnow()
-
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
@@ -14,14 +11,31 @@ class RefreshToken(Base):
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), index=True
     )
-    token_hash: Mapped[str] = mapped_column(String(64), index=True)
+    # 索引改由 __table_args__ 宣告（unique：同一個 RT 雜湊只能存在一筆）
+    token_hash: Mapped[str] = mapped_column(String(64))
 
     # ✅ 全部改成 timezone=False（naive datetime）
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), index=True)
-    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=utcnow_naive)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True, index=True)
+    # 沒帶值時交給 DB 取時間；MySQL 的 NOW() 是 session 時區，所以用 UTC_TIMESTAMP()
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), default=func.utc_timestamp())
 
     created_ip: Mapped[str | None] = mapped_column(String(45), nullable=True)
     created_user_agent: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
-    user = relationship("User", lazy="joined")
+    # 建立 RT 當下的 users.status 快照：/refresh 直接用它判斷 is_guest，不必再 JOIN users
+    user_status: Mapped[str] = mapped_column(String(16), default="guest")
+
+    user = relationship("User", lazy="select")
+
+    __table_args__ = (
+        # 依 user 撤銷 / 清理過期 RT 用
+        Index("ix_refresh_tokens_user_expires", "user_id", "expires_at"),
+        # MySQL(InnoDB) 沒有 INCLUDE，postgresql_include 只在 Postgres 生效
+        Index(
+            "ix_refresh_tokens_hash_covering",
+            "token_hash",
+            unique=True,
+            postgresql_include=["user_id", "expires_at", "revoked_at"],
+        ),
+    )
@@ -13,9 +13,11 @@ async def add_refresh_token(
     expires_at: datetime,
     created_ip: str | None,
     created_user_agent: str | None,
+    user_status: str,
 ) -> RefreshToken:
     """
     新增一筆 RT（只存雜湊，不存明文）
+    user_status：發 RT 當下的 users.status（/refresh 用它決定 is_guest）
     """
     rt = RefreshToken(
         user_id=user_id,
@@ -23,6 +25,7 @@ async def add_refresh_token(
         expires_at=expires_at,
         created_ip=created_ip,
         created_user_agent=created_user_agent,
+        user_status=user_status,
     )
     db.add(rt)
     await db.flush()
@@ -1,11 +1,16 @@
 # app/routers/auth_google.py
+import asyncio
+import threading
+import time
+
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, insert, lambda_stmt, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 from datetime import datetime
 
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.core.security import (
     create_access_token,
     generate_refresh_token,
@@ -16,8 +21,8 @@ from app.models.user import User
 from app.models.refresh_token import RefreshToken
 from app.core.config import settings
 
-from google.oauth2 import id_token as google_id_token
-from google.auth.transport import requests as google_requests
+import jwt  # PyJWT（RSA 驗簽走 cryptography / OpenSSL）
+import requests
 
 # 你可以放在 app/core/config.py 用 settings 管
 GOOGLE_CLIENT_ID = settings.GOOGLE_CLIENT_ID
@@ -26,6 +31,24 @@ if not GOOGLE_CLIENT_ID:
 
 router = APIRouter(tags=["auth"])
 
+# ---- Google 公鑰（JWKS）快取 ----
+# 共用一條連線抓 JWKS，key 先解析成 RSA 公鑰物件放在 process 內，驗簽時直接用
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_JWKS_TTL_SECONDS = 6 * 3600
+# 遇到不認得的 kid 最快多久才能再抓一次（header 未驗證，任何人都能亂填 kid）
+GOOGLE_JWKS_MIN_REFETCH_SECONDS = 60
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+_google_session = requests.Session()
+_google_jwks: dict[str, jwt.PyJWK] = {}
+_google_jwks_fetched_at: float | None = None
+_google_jwks_lock = threading.Lock()
+
+# 熱路徑查詢：lambda_stmt 會快取組好的 SQL，不用每個 request 重新建 ORM query
+_find_user_by_google_sub = lambda_stmt(
+    lambda: select(User).where(User.google_sub == bindparam("sub"))
+)
+
 
 class GoogleAuthIn(BaseModel):
     id_token: str = Field(..., min_length=20)
@@ -41,15 +64,53 @@ class GoogleAuthOut(BaseModel):
     refresh_expires_in: int
 
 
+def _get_google_key(kid: str | None) -> jwt.PyJWK:
+    """
+    依 kid 取 Google 公鑰。過期才重新抓 JWKS；
+    找不到 kid（Google 換 key）時，距上次抓超過 GOOGLE_JWKS_MIN_REFETCH_SECONDS 才會再抓，
+    否則直接當成無效 token，避免亂填 kid 就能讓每個 request 都打一次 Google。
+    """
+    global _google_jwks, _google_jwks_fetched_at
+    with _google_jwks_lock:
+        age = (
+            float("inf") if _google_jwks_fetched_at is None
+            else time.monotonic() - _google_jwks_fetched_at
+        )
+        unknown_kid = kid not in _google_jwks
+        if age >= GOOGLE_JWKS_TTL_SECONDS or (unknown_kid and age >= GOOGLE_JWKS_MIN_REFETCH_SECONDS):
+            resp = _google_session.get(GOOGLE_JWKS_URL, timeout=5)
+            resp.raise_for_status()
+            _google_jwks = {k["kid"]: jwt.PyJWK(k) for k in resp.json()["keys"]}
+            _google_jwks_fetched_at = time.monotonic()
+        key = _google_jwks.get(kid)
+    if key is None:
+        raise LookupError(f"unknown Google JWKS kid: {kid!r}")
+    return key
+
+
+async def _promote_user_rts(db: AsyncSession, user_id: int) -> None:
+    """
+    user 升級成正式帳號時，之前發出去的 RT 也一起改成 user，避免 /refresh 還當成 guest。
+    """
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id)
+        .values(user_status="user")
+    )
+
+
 def verify_google_token(token: str) -> dict:
     """
     驗證 Google ID Token，成功回傳 claims（含 sub/email）。
     """
     try:
-        info = google_id_token.verify_oauth2_token(
+        kid = jwt.get_unverified_header(token).get("kid")
+        info = jwt.decode(
             token,
-            google_requests.Request(),
-            GOOGLE_CLIENT_ID,
+            key=_get_google_key(kid),
+            algorithms=["RS256"],
+            audience=GOOGLE_CLIENT_ID,
+            issuer=GOOGLE_ISSUERS,
         )
     except Exception:
         raise HTTPException(
@@ -76,30 +137,35 @@ def verify_google_token(token: str) -> dict:
 
 
 @router.post("/auth/google", response_model=GoogleAuthOut)
-def google_auth(payload: GoogleAuthIn, request: Request, db: Session = Depends(get_db)):
+async def google_auth(payload: GoogleAuthIn, request: Request, db: AsyncSession = Depends(get_async_db)):
     now = datetime.utcnow()
-    info = verify_google_token(payload.id_token)
+    # PyJWT 的 RSA 驗簽是 CPU 工作，偶爾還要同步抓一次 JWKS，丟到 thread 避免卡住 event loop
+    info = await asyncio.to_thread(verify_google_token, payload.id_token)
 
     google_sub = str(info["sub"])
     email = str(info["email"]).lower().strip()
 
     # 1) 先看是否已綁定（用 sub 最準）
-    user = db.query(User).filter(User.google_sub == google_sub).first()
+    user = (await db.execute(_find_user_by_google_sub, {"sub": google_sub})).scalar_one_or_none()
 
     if user is None:
         # 2) 如果帶 device_id，嘗試把 guest 升級綁定（保留原資料）
         if payload.device_id:
-            guest = db.query(User).filter(
-                User.device_id == payload.device_id,
-                User.status == "guest",
-            ).first()
+            guest = (await db.execute(
+                select(User).where(
+                    User.device_id == payload.device_id,
+                    User.status == "guest",
+                ).limit(1)
+            )).scalars().first()
 
             if guest:
                 # 若 email 已被另一個帳號使用（例如別人先用 email 註冊），避免合併錯帳
-                email_owner = db.query(User).filter(
-                    User.email == email,
-                    User.id != guest.id,
-                ).first()
+                email_owner = (await db.execute(
+                    select(User).where(
+                        User.email == email,
+                        User.id != guest.id,
+                    ).limit(1)
+                )).scalars().first()
                 if email_owner and email_owner.google_sub != google_sub:
                     raise HTTPException(
                         status_code=status.HTTP_409_CONFLICT,
@@ -112,6 +178,8 @@ def google_auth(payload: GoogleAuthIn, request: Request, db: Session = Depends(g
                 guest.auth_provider = "google"
                 guest.last_login_at = now
                 user = guest
+
+                await _promote_user_rts(db, int(guest.id))
             else:
                 # device_id 找不到對應 guest，就建立新 user
                 user = User(
@@ -136,8 +204,8 @@ def google_auth(payload: GoogleAuthIn, request: Request, db: Session = Depends(g
             )
             db.add(user)
 
-        db.commit()
-        db.refresh(user)
+        # 只 flush 取得 user.id（INSERT 的自增 id 由 driver 帶回，不需再 SELECT），最後跟 RT 一起 commit
+        await db.flush()
     else:
         # 已綁定：更新登入時間/補 email
         user.last_login_at = now
@@ -145,10 +213,9 @@ def google_auth(payload: GoogleAuthIn, request: Request, db: Session = Depends(g
             user.email = email
         if user.status != "user":
             user.status = "user"
+            await _promote_user_rts(db, int(user.id))
         if user.auth_provider != "google":
             user.auth_provider = "google"
-        db.commit()
-        db.refresh(user)
 
     # 3) 發 Access Token（is_guest=False）
     access_token, expires_in, _ = create_access_token(user_id=int(user.id), is_guest=False)
@@ -161,17 +228,21 @@ def google_auth(payload: GoogleAuthIn, request: Request, db: Session = Depends(g
     created_ip = request.client.host if request.client else None
     ua = request.headers.get("user-agent", "")[:255]
 
-    rt_row = RefreshToken(
-        user_id=int(user.id),
-        token_hash=rt_hash,
-        expires_at=rt_expires_at,
-        revoked_at=None,
-        created_at=now,
-        created_ip=created_ip,
-        created_user_agent=ua,
+    # Core insert：RT 之後不會再用到 ORM 物件，省掉 unit-of-work / identity map
+    await db.execute(
+        insert(RefreshToken).values(
+            user_id=int(user.id),
+            token_hash=rt_hash,
+            expires_at=rt_expires_at,
+            revoked_at=None,
+            created_at=now,
+            created_ip=created_ip,
+            created_user_agent=ua,
+            user_status=user.status,
+        )
     )
-    db.add(rt_row)
-    db.commit()
+    # user upsert + RT insert 在同一個 transaction 一次 commit
+    await db.commit()
 
     return GoogleAuthOut(
         user_id=int(user.id),
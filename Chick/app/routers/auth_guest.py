@@ -83,6 +83,7 @@ def guest_login(payload: GuestIn, request: Request, db: Session = Depends(get_db
         created_at=now,
         created_ip=created_ip,
         created_user_agent=ua,
+        user_status=user.status,
     )
     db.add(r)
     db.commit()
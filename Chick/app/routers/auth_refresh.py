@@ -1,11 +1,12 @@
 # app/routers/auth_refresh.py
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, insert, lambda_stmt, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 from starlette import status
 
-from app.core.db import get_db
+from app.core.db import get_async_db
 from app.core.security import (
     create_access_token,
     generate_refresh_token,
@@ -13,10 +14,14 @@ from app.core.security import (
     refresh_token_expiry,
 )
 from app.models.refresh_token import RefreshToken
-from app.models.user import User
 
 router = APIRouter(tags=["auth"])
 
+# 熱路徑查詢：lambda_stmt 會快取組好的 SQL，不用每個 request 重新建 ORM query
+_find_rt_by_hash = lambda_stmt(
+    lambda: select(RefreshToken).where(RefreshToken.token_hash == bindparam("h"))
+)
+
 class RefreshIn(BaseModel):
     refresh_token: str
 
@@ -27,15 +32,13 @@ class RefreshOut(BaseModel):
     refresh_token_expires_in: int
 
 @router.post("/refresh", response_model=RefreshOut)
-def refresh_token(payload: RefreshIn, request: Request, db: Session = Depends(get_db)):
+async def refresh_token(payload: RefreshIn, request: Request, db: AsyncSession = Depends(get_async_db)):
     # 和你原本寫法一致：用 naive 來比（避免 aware/naive 比較噴錯）
     now = datetime.utcnow()
 
     old_hash = hash_refresh_token(payload.refresh_token)
 
-    old_rt = db.query(RefreshToken).filter(
-        RefreshToken.token_hash == old_hash
-    ).first()
+    old_rt = (await db.execute(_find_rt_by_hash, {"h": old_hash})).scalar_one_or_none()
 
     if not old_rt or old_rt.revoked_at or old_rt.expires_at <= now:
         raise HTTPException(
@@ -43,18 +46,25 @@ def refresh_token(payload: RefreshIn, request: Request, db: Session = Depends(ge
             detail="Invalid refresh token"
         )
 
-    # 1) 查 user.status，決定 is_guest
-    user = db.query(User).filter(User.id == old_rt.user_id).first()
-    if not user:
+    # 1) 用 RT 上的 user_status 快照決定 is_guest（不用再查 users）
+    user_id = int(old_rt.user_id)
+    user_status = old_rt.user_status
+    is_guest = (user_status == "guest")
+
+    # 2) 撤銷舊 RT（rotation）；和新 RT 同一個 transaction，最後一起 commit
+    #    條件式 UPDATE：同一個 RT 併發 refresh 時只有一個能撤銷成功，另一個當成重放拒絕
+    res = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == old_rt.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount != 1:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
+            detail="Invalid refresh token"
         )
-    is_guest = (user.status == "guest")
-
-    # 2) 先撤銷舊 RT（rotation）
-    old_rt.revoked_at = now
-    db.commit()
 
     # 3) 建立新 RT（明文只回一次；DB 存 hash）
     new_rt_plain = generate_refresh_token()
@@ -64,20 +74,23 @@ def refresh_token(payload: RefreshIn, request: Request, db: Session = Depends(ge
     created_ip = request.client.host if request.client else None
     ua = request.headers.get("user-agent", "")[:255]
 
-    new_rt = RefreshToken(
-        user_id=int(user.id),
-        token_hash=new_rt_hash,
-        expires_at=new_expires_at,
-        revoked_at=None,
-        created_at=now,
-        created_ip=created_ip,
-        created_user_agent=ua,
+    # Core insert：新 RT 之後不會再用到 ORM 物件，省掉 unit-of-work / identity map
+    await db.execute(
+        insert(RefreshToken).values(
+            user_id=user_id,
+            token_hash=new_rt_hash,
+            expires_at=new_expires_at,
+            revoked_at=None,
+            created_at=now,
+            created_ip=created_ip,
+            created_user_agent=ua,
+            user_status=user_status,
+        )
     )
-    db.add(new_rt)
-    db.commit()
+    await db.commit()
 
     # 4) 發新 AT（依 status 決定 guest/user）
-    at, at_expires_in, _ = create_access_token(user_id=int(user.id), is_guest=is_guest)
+    at, at_expires_in, _ = create_access_token(user_id=user_id, is_guest=is_guest)
 
     return RefreshOut(
         access_token=at,
@@ -13,7 +13,11 @@ from app.schemas.economy import (
 from app.services.ledger import add_ledger_entry
 from app.models.user import User
 from app.services.level import apply_exp_and_update
-from app.services.chicken_status import calc_chicken_status, chicken_exp_multiplier
+from app.services.chicken_status import (
+    calc_chicken_status,
+    chicken_exp_multiplier,
+    invalidate_chicken_status,
+)
 
 from app.services.achievements import check_and_unlock_achievements
 from app.services.challenges import check_weekly_challenge
@@ -209,6 +213,7 @@ def checkin_end(payload: CheckinEndIn, user_id: int = Depends(get_current_user_i
         row.reason = "DAILY_LIMIT_REACHED"
         row.coins_awarded = 0  # ✅ 明確寫 0，避免舊值殘留
         db.commit()
+        invalidate_chicken_status(user_id)
         return CheckinEndOut(verified=True, dwell_minutes=row.accum_minutes, coins_awarded=0)
 
 
@@ -219,6 +224,7 @@ def checkin_end(payload: CheckinEndIn, user_id: int = Depends(get_current_user_i
 
     row.status = CheckinStatus.verified
     db.commit()
+    invalidate_chicken_status(user_id)
 
     awarded = add_ledger_entry(
         db=db,
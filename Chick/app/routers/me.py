@@ -12,10 +12,10 @@ from app.models.economy import Checkin, CheckinStatus
 from app.models.user import User
 from app.services.level import calc_exp_progress
 from app.services.chicken_status import (
-    get_weekly_activity_count,
-    calc_chicken_status,
+    get_activity_summary,
+    chicken_status_from_summary,
     get_all_activity_dates,
-    calc_current_streak,
+    get_current_streak,
 )
 
 router = APIRouter(prefix="/me", tags=["me"])
@@ -88,6 +88,9 @@ def read_me(
     if not user:
         raise HTTPException(status_code=404, detail="user not found")
 
+    # 這個 request 共用同一個時間點
+    now = datetime.utcnow()
+
     # 2) 金幣餘額
     coins = get_coins_balance(db, user_id)
 
@@ -95,13 +98,12 @@ def read_me(
     today_status = get_today_checkin_status(db, user_id)
 
     # 4) 本週運動次數 & 小雞狀態
-    weekly_count = get_weekly_activity_count(db, user_id)
-    chicken_status = calc_chicken_status(db, user_id)
+    last_activity_at, weekly_count = get_activity_summary(db, user_id, now)
+    chicken_status = chicken_status_from_summary(last_activity_at, weekly_count, now)
 
 
     # 5) 連續運動天數（streak）
-    activity_dates = get_all_activity_dates(db, user_id)
-    current_streak = calc_current_streak(activity_dates)
+    current_streak = get_current_streak(db, user_id, now)
     
     # 6) 計算等級 + 經驗值進度
     total_exp = user.exp or 0
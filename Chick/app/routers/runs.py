@@ -14,6 +14,7 @@ from app.services.chicken_status import (
     get_weekly_activity_count,
     calc_chicken_status,
     chicken_exp_multiplier,
+    invalidate_chicken_status,
 )
 from app.services.achievements import check_and_unlock_achievements
 from app.services.challenges import check_weekly_challenge
@@ -52,6 +53,7 @@ def runs_summary(payload: RunSummaryIn, user_id: int = Depends(get_current_user_
     db.add(row)
     db.commit()
     db.refresh(row)
+    invalidate_chicken_status(user_id)
 
     add_ledger_entry(
         db=db, user_id=user_id, delta=coins,
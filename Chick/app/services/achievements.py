@@ -9,7 +9,7 @@ from app.models.economy import (
 from app.models.user import User
 from app.services.ledger import add_ledger_entry
 from app.services.level import apply_exp_and_update
-from app.services.chicken_status import get_all_activity_dates, calc_current_streak
+from app.services.chicken_status import get_current_streak
 
 def _get_basic_stats(db: Session, user_id: int) -> dict:
     total_checkins = (
@@ -28,8 +28,7 @@ def _get_basic_stats(db: Session, user_id: int) -> dict:
         )
         .scalar() or 0
     )
-    dates = get_all_activity_dates(db, user_id)
-    current_streak = calc_current_streak(dates)
+    current_streak = get_current_streak(db, user_id)
 
     return {
         "total_checkins": total_checkins,
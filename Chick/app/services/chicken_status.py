@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta, date
-from sqlalchemy import func
+from sqlalchemy import case, func, select, union, union_all
 from sqlalchemy.orm import Session
 
+from app.core.cache import cache_delete, cache_get, cache_setex
 from app.models.economy import Checkin, CheckinStatus, Run, RunStatus
 
 
@@ -12,11 +13,12 @@ from app.models.economy import Checkin, CheckinStatus, Run, RunStatus
 #  Week range / weekly count
 # ========================
 
-def get_week_range_utc() -> tuple[datetime, datetime]:
+def get_week_range_utc(now: datetime | None = None) -> tuple[datetime, datetime]:
     """
     回傳本週區間 [週一 00:00, 下週一 00:00)，使用 UTC。
+    now：呼叫端已經取過的時間（同一個 request 共用），沒給就自己取。
     """
-    today = datetime.utcnow().date()
+    today = (now or datetime.utcnow()).date()
     monday = today - timedelta(days=today.weekday())  # Monday=0 ... Sunday=6
     week_start = datetime(monday.year, monday.month, monday.day)
     week_end = week_start + timedelta(days=7)
@@ -36,13 +38,13 @@ def _valid_checkin_statuses() -> list[CheckinStatus]:
     return statuses
 
 
-def get_weekly_activity_count(db: Session, user_id: int) -> int:
+def get_weekly_activity_count(db: Session, user_id: int, now: datetime | None = None) -> int:
     """
     計算本週運動次數（UTC 週一～下週一）：
     - 有效打卡：status in [verified, (awarded 若存在)]
     - 有效跑步：status = awarded（依你的 RunStatus 設計）
     """
-    week_start, week_end = get_week_range_utc()
+    week_start, week_end = get_week_range_utc(now)
 
     # 打卡次數
     checkin_count = (
@@ -77,40 +79,46 @@ def get_weekly_activity_count(db: Session, user_id: int) -> int:
 
 WEAK_AFTER_DAYS = 4        # 5 天沒運動才 weak
 STRONG_WEEKLY_COUNT = 3    # 本週 >= 5 次才 strong
+CHICKEN_STATUS_CACHE_TTL = 3600  # 秒；有新運動時會主動清掉
 
 
-def get_last_activity_at(db: Session, user_id: int) -> datetime | None:
+def get_activity_summary(
+    db: Session, user_id: int, now: datetime | None = None
+) -> tuple[datetime | None, int]:
     """
-    取得「最近一次運動時間」（UTC）：
-    - 打卡：取 ended_at 最大值（status=有效打卡，且 ended_at 不為 None）
-    - 跑步：取 created_at 最大值（status=awarded）
-
-    若你之後要把 training logs 也算運動，把它加進 candidates 即可。
+    一次查詢取回 (最近一次運動時間, 本週運動次數)（原本要 4 次查詢）：
+    - 打卡：最近時間看 ended_at，本週次數看 started_at
+    - 跑步：兩者都看 created_at
     """
-    last_checkin = (
-        db.query(func.max(Checkin.ended_at))
-        .filter(
-            Checkin.user_id == user_id,
-            Checkin.status.in_(_valid_checkin_statuses()),
-            Checkin.ended_at.isnot(None),
-        )
-        .scalar()
+    week_start, week_end = get_week_range_utc(now)
+
+    checkins = select(
+        Checkin.ended_at.label("last_at"),
+        Checkin.started_at.label("week_at"),
+    ).where(
+        Checkin.user_id == user_id,
+        Checkin.status.in_(_valid_checkin_statuses()),
     )
-
-    last_run = (
-        db.query(func.max(Run.created_at))
-        .filter(
-            Run.user_id == user_id,
-            Run.status == RunStatus.awarded,
-        )
-        .scalar()
+    runs = select(
+        Run.created_at.label("last_at"),
+        Run.created_at.label("week_at"),
+    ).where(
+        Run.user_id == user_id,
+        Run.status == RunStatus.awarded,
     )
+    t = union_all(checkins, runs).subquery()
 
-    candidates = [t for t in [last_checkin, last_run] if t is not None]
-    return max(candidates) if candidates else None
+    in_week = (t.c.week_at >= week_start) & (t.c.week_at < week_end)
+    last_at, weekly_count = db.execute(
+        select(
+            func.max(t.c.last_at),
+            func.coalesce(func.sum(case((in_week, 1), else_=0)), 0),
+        )
+    ).one()
+    return last_at, int(weekly_count)
 
 
-def calc_chicken_status(db: Session, user_id: int) -> str:
+def calc_chicken_status(db: Session, user_id: int, now: datetime | None = None) -> str:
     """
     你要的新規則（v2）：
     1) 新用戶/完全沒運動紀錄：normal
@@ -118,10 +126,44 @@ def calc_chicken_status(db: Session, user_id: int) -> str:
     3) 最近 5 天內有運動：
        - 本週運動次數 >= 5：strong
        - 否則：normal
+
+    同一天內結果不變（除非有新運動），所以用 Redis 依 (user_id, UTC 日期) 快取。
+    """
+    now = now or datetime.utcnow()
+    key = _chicken_status_cache_key(user_id, now.date())
+
+    cached = cache_get(key)
+    if cached is not None:
+        return cached
+
+    status = _calc_chicken_status(db, user_id, now)
+    cache_setex(key, CHICKEN_STATUS_CACHE_TTL, status)
+    return status
+
+
+def invalidate_chicken_status(user_id: int) -> None:
+    """
+    打卡 / 跑步發獎後呼叫，讓下一次 calc_chicken_status 重算。
     """
-    now = datetime.utcnow()
+    cache_delete(_chicken_status_cache_key(user_id, datetime.utcnow().date()))
+
+
+def _chicken_status_cache_key(user_id: int, day: date) -> str:
+    return f"chicken_status:{user_id}:{day:%Y%m%d}"
 
-    last_activity_at = get_last_activity_at(db, user_id)
+
+def _calc_chicken_status(db: Session, user_id: int, now: datetime) -> str:
+    last_activity_at, weekly_count = get_activity_summary(db, user_id, now)
+    return chicken_status_from_summary(last_activity_at, weekly_count, now)
+
+
+def chicken_status_from_summary(
+    last_activity_at: datetime | None, weekly_count: int, now: datetime
+) -> str:
+    """
+    用 get_activity_summary 的結果套 calc_chicken_status 的規則（不查 DB）。
+    給本來就需要本週次數的地方（例如 /me）用，省掉另外再查一次。
+    """
     if last_activity_at is None:
         return "normal"
 
@@ -129,7 +171,6 @@ def calc_chicken_status(db: Session, user_id: int) -> str:
     if days_since >= WEAK_AFTER_DAYS:
         return "weak"
 
-    weekly_count = get_weekly_activity_count(db, user_id)
     if weekly_count >= STRONG_WEEKLY_COUNT:
         return "strong"
 
@@ -160,47 +201,65 @@ def get_all_activity_dates(db: Session, user_id: int) -> set[date]:
     - 有效打卡：status in [verified, (awarded 若存在)] → 使用 started_at.date()
     - 有效跑步：status = awarded → 使用 created_at.date()
     """
+    # 在 DB 端就轉成日期並去重，只傳回不重複的 DATE
     q1 = (
-        db.query(Checkin.started_at)
+        db.query(func.date(Checkin.started_at))
         .filter(
             Checkin.user_id == user_id,
             Checkin.status.in_(_valid_checkin_statuses()),
         )
+        .distinct()
         .all()
     )
     q2 = (
-        db.query(Run.created_at)
+        db.query(func.date(Run.created_at))
         .filter(
             Run.user_id == user_id,
             Run.status == RunStatus.awarded,
         )
+        .distinct()
         .all()
     )
 
-    dates: set[date] = set()
-    for (dt,) in q1:
-        if dt:
-            dates.add(dt.date())
-    for (dt,) in q2:
-        if dt:
-            dates.add(dt.date())
+    dates: set[date] = {d for (d,) in q1 if d}
+    dates.update(d for (d,) in q2 if d)
     return dates
 
 
-def calc_current_streak(activity_dates: set[date]) -> int:
+def get_current_streak(db: Session, user_id: int, now: datetime | None = None) -> int:
     """
-    計算「從今天往回算」的連續運動天數。
+    計算「從今天往回算」的連續運動天數（UTC 日期），直接在 DB 算完只回一個數字。
     例如今天有運動、昨天有、前天沒 → streak = 2
+
+    作法：有運動的日期由新到舊編號 rn=1,2,3...，
+    連續段落裡 DATEDIFF(今天, d) 剛好等於 rn-1，一斷掉之後就永遠對不上，
+    所以符合條件的筆數就是 streak。
     """
-    if not activity_dates:
-        return 0
+    today = (now or datetime.utcnow()).date()
 
-    today = datetime.utcnow().date()
-    streak = 0
-    cur = today
+    days = union(
+        select(func.date(Checkin.started_at).label("d")).where(
+            Checkin.user_id == user_id,
+            Checkin.status.in_(_valid_checkin_statuses()),
+        ),
+        select(func.date(Run.created_at).label("d")).where(
+            Run.user_id == user_id,
+            Run.status == RunStatus.awarded,
+        ),
+    ).subquery()
 
-    while cur in activity_dates:
-        streak += 1
-        cur = cur - timedelta(days=1)
+    ranked = (
+        select(
+            days.c.d,
+            func.row_number().over(order_by=days.c.d.desc()).label("rn"),
+        )
+        .where(days.c.d <= today)
+        .subquery()
+    )
 
-    return streak
+    streak = db.execute(
+        select(func.count())
+        .select_from(ranked)
+        .where(func.datediff(today, ranked.c.d) == ranked.c.rn - 1)
+    ).scalar()
+    return int(streak or 0)
@@ -1,15 +1,22 @@
 # app/services/ledger.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from datetime import datetime
-from app.models.economy import CoinsLedger
+from app.models.economy import CoinsLedger, UserCoinBalance
 
 def get_coins_balance(db: Session, user_id: int) -> int:
-    total = db.query(func.coalesce(func.sum(CoinsLedger.delta), 0)).filter(
-        CoinsLedger.user_id == user_id
+    # 直接讀 user_coin_balances（PK 查詢），不再每次 SUM 整本帳
+    total = db.query(UserCoinBalance.balance).filter(
+        UserCoinBalance.user_id == user_id
     ).scalar()
     return int(total or 0)
 
+def _apply_balance_delta(db: Session, user_id: int, delta: int) -> None:
+    stmt = mysql_insert(UserCoinBalance).values(user_id=user_id, balance=delta)
+    db.execute(
+        stmt.on_duplicate_key_update(balance=UserCoinBalance.balance + stmt.inserted.balance)
+    )
+
 def add_ledger_entry(
     db: Session,
     user_id: int,
@@ -22,15 +29,40 @@ def add_ledger_entry(
     Idempotent ledger insert.
     - 若已存在同一筆（用 idempotency_key 優先，其次 source+ref_id），回傳既有 delta（不要回 0）
     - 若不存在才插入，並回傳本次 delta
+
+    冪等由 DB 的 unique index（ix_coins_idem / ix_coins_srcref）保證：
+    直接 INSERT ... ON DUPLICATE KEY UPDATE id=id，沒插進去才回頭查既有那筆，一般情況只要 1 次查詢。
+    （不用 INSERT IGNORE：它會把 FK / NOT NULL / 截斷等錯誤也吞成 warning）
     """
+    stmt = mysql_insert(CoinsLedger).values(
+        user_id=user_id,
+        delta=delta,
+        source=source,
+        ref_id=ref_id,
+        idempotency_key=idempotency_key,
+        created_at=datetime.utcnow(),
+    )
+    res = db.execute(stmt.on_duplicate_key_update(id=CoinsLedger.id))
+
+    # 真的插入：affected rows = 1 且有新的自增 id。
+    # 撞到既有 key 時 affected rows 是 0（driver 開 CLIENT_FOUND_ROWS 時會回 1），但 lastrowid 為 0。
+    if res.rowcount == 1 and res.lastrowid:
+        # 餘額和帳本同一個 transaction 更新
+        _apply_balance_delta(db, user_id, delta)
+        db.commit()
+        return int(delta)
+
     exists = None
 
+    # 撞到 key 多半是併發重試：呼叫端可能已經開了 REPEATABLE READ 的讀取快照，
+    # 一般 SELECT 看不到對方剛 commit 的那筆，所以用 locking read（FOR UPDATE）讀最新資料。
+
     # ✅ 1) 優先用 idempotency_key 做冪等（最穩）
     if idempotency_key:
         exists = db.query(CoinsLedger).filter(
             CoinsLedger.user_id == user_id,
             CoinsLedger.idempotency_key == idempotency_key,
-        ).first()
+        ).with_for_update().first()
 
     # ✅ 2) 沒有 idempotency_key 再用 source + ref_id
     if not exists and ref_id is not None:
@@ -38,20 +70,15 @@ def add_ledger_entry(
             CoinsLedger.user_id == user_id,
             CoinsLedger.source == source,
             CoinsLedger.ref_id == ref_id,
-        ).first()
+        ).with_for_update().first()
 
-    # ✅ 已存在：回傳既有 delta（避免重試把 coins_awarded 洗成 0）
-    if exists:
-        return int(exists.delta)
+    if not exists:
+        raise RuntimeError(
+            f"coins_ledger insert skipped but no existing row found "
+            f"(user_id={user_id}, source={source}, ref_id={ref_id}, idempotency_key={idempotency_key})"
+        )
 
-    row = CoinsLedger(
-        user_id=user_id,
-        delta=delta,
-        source=source,
-        ref_id=ref_id,
-        idempotency_key=idempotency_key,
-        created_at=datetime.utcnow(),
-    )
-    db.add(row)
-    db.commit()
-    return int(delta)
+    # ✅ 已存在：回傳既有 delta（避免重試把 coins_awarded 洗成 0）
+    delta_existing = int(exists.delta)
+    db.commit()  # 放掉 FOR UPDATE 的 row lock（和插入成功時一樣在這裡 commit）
+    return delta_existing
@@ -0,0 +1,71 @@
+# app/services/token_gc.py
+"""
+定期清掉過期 / 已撤銷的 refresh_tokens，讓 token_hash 索引保持小、留在記憶體裡。
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db import AsyncSessionLocal
+from app.models.refresh_token import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+RT_GC_INTERVAL_SECONDS = 3600
+RT_GC_BATCH_SIZE = 10_000
+RT_REVOKED_KEEP_DAYS = 7   # 撤銷後保留幾天（方便查 RT 重放）
+
+
+async def purge_refresh_tokens(db: AsyncSession, now: datetime | None = None) -> int:
+    """
+    分批刪除：已過期，或撤銷超過 RT_REVOKED_KEEP_DAYS 天的 RT。
+    兩個條件分開刪（各自走 expires_at / revoked_at 索引；OR 在 MySQL 會變全表掃描），
+    每批各自 commit，避免一次鎖太多列。回傳總刪除筆數。
+    """
+    now = now or datetime.utcnow()
+    revoked_before = now - timedelta(days=RT_REVOKED_KEEP_DAYS)
+
+    total = await _delete_in_batches(db, RefreshToken.expires_at < now)
+    total += await _delete_in_batches(db, RefreshToken.revoked_at < revoked_before)
+    return total
+
+
+async def _delete_in_batches(db: AsyncSession, condition) -> int:
+    stmt = (
+        delete(RefreshToken)
+        .where(condition)
+        .with_dialect_options(mysql_limit=RT_GC_BATCH_SIZE)
+    )
+
+    total = 0
+    while True:
+        res = await db.execute(stmt)
+        await db.commit()
+        deleted = res.rowcount or 0
+        total += deleted
+        if deleted < RT_GC_BATCH_SIZE:
+            return total
+
+
+async def refresh_token_gc_loop(
+    interval_seconds: int = RT_GC_INTERVAL_SECONDS,
+    initial_delay_seconds: int = 0,
+) -> None:
+    """
+    背景任務：啟動後先等 initial_delay_seconds，之後每 interval_seconds 跑一次 purge_refresh_tokens。
+    """
+    await asyncio.sleep(initial_delay_seconds)
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                deleted = await purge_refresh_tokens(db)
+            if deleted:
+                logger.info("refresh_tokens GC: deleted %d rows", deleted)
+        except Exception:
+            logger.exception("refresh_tokens GC failed")
+        await asyncio.sleep(interval_seconds)
@@ -1,4 +1,7 @@
 # path: app/main.py
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -18,8 +21,26 @@ from app.routers.challenges import router as challenges
 from app.routers.training_plans import router as training_plans
 from app.models.gym import Gym  # noqa
 from app.routers.auth_google import router as auth_google  # noqa
+from app.core.config import settings
+from app.services.token_gc import refresh_token_gc_loop
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 背景清理過期 / 已撤銷的 refresh_tokens（只在 RT_GC_ENABLED 的那個 worker 跑）
+    gc_task = None
+    if settings.RT_GC_ENABLED:
+        gc_task = asyncio.create_task(
+            refresh_token_gc_loop(initial_delay_seconds=settings.RT_GC_INITIAL_DELAY_SECONDS)
+        )
+    yield
+    if gc_task is not None:
+        gc_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await gc_task
+
 
-app = FastAPI(title="Chicken Backend")
+app = FastAPI(title="Chicken Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
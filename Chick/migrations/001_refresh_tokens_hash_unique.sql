@@ -0,0 +1,19 @@
+-- 001: refresh_tokens.token_hash 改成 unique index（/auth/refresh 熱路徑）
+-- MySQL 沒有 CREATE INDEX CONCURRENTLY / INCLUDE，改用 online DDL（不鎖表）
+USE chicken_db;
+
+-- 先確認沒有重複的 token_hash（有的話要先清掉，否則建 unique index 會失敗）
+-- SELECT token_hash, COUNT(*) FROM refresh_tokens
+--   GROUP BY token_hash HAVING COUNT(*) > 1;
+
+-- 先建新的 unique index，建好之前舊索引還在，/auth/refresh 查詢不會變全表掃描
+CREATE UNIQUE INDEX ix_refresh_tokens_hash_covering
+    ON refresh_tokens (token_hash)
+    ALGORITHM = INPLACE LOCK = NONE;
+
+-- 新索引建好後才拿掉舊的 inline index（SQLAlchemy 預設命名）
+DROP INDEX ix_refresh_tokens_token_hash ON refresh_tokens;
+
+-- Postgres 版本：
+-- CREATE UNIQUE INDEX CONCURRENTLY ix_refresh_tokens_hash_covering
+--     ON refresh_tokens (token_hash) INCLUDE (user_id, expires_at, revoked_at);
@@ -0,0 +1,10 @@
+-- 002: refresh_tokens 加上 user_status 快照（/auth/refresh 不再查 users）
+USE chicken_db;
+
+ALTER TABLE refresh_tokens
+    ADD COLUMN user_status VARCHAR(16) NOT NULL DEFAULT 'guest';
+
+-- 既有資料用 users.status 回填
+UPDATE refresh_tokens rt
+JOIN users u ON u.id = rt.user_id
+SET rt.user_status = u.status;
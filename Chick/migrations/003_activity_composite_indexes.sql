@@ -0,0 +1,15 @@
+-- 003: chicken_status / streak 熱查詢用的複合索引
+-- MySQL 沒有 partial index（WHERE ended_at IS NOT NULL），ended_at 索引改成完整索引
+USE chicken_db;
+
+CREATE INDEX ix_checkins_user_status_started
+    ON checkins (user_id, status, started_at)
+    ALGORITHM = INPLACE LOCK = NONE;
+
+CREATE INDEX ix_checkins_user_status_ended
+    ON checkins (user_id, status, ended_at)
+    ALGORITHM = INPLACE LOCK = NONE;
+
+CREATE INDEX ix_runs_user_status_created
+    ON runs (user_id, status, created_at)
+    ALGORITHM = INPLACE LOCK = NONE;
@@ -0,0 +1,17 @@
+-- 004: coins_ledger 冪等改由 unique index 保證（配合 INSERT IGNORE）
+-- MySQL unique index 允許多筆 NULL，效果等同 Postgres 的 partial unique index
+USE chicken_db;
+
+-- 先確認沒有重複資料（有的話要先清掉，否則建 index 會失敗）
+-- SELECT user_id, idempotency_key, COUNT(*) FROM coins_ledger
+--   WHERE idempotency_key IS NOT NULL GROUP BY user_id, idempotency_key HAVING COUNT(*) > 1;
+-- SELECT user_id, source, ref_id, COUNT(*) FROM coins_ledger
+--   WHERE ref_id IS NOT NULL GROUP BY user_id, source, ref_id HAVING COUNT(*) > 1;
+
+CREATE UNIQUE INDEX ix_coins_idem
+    ON coins_ledger (user_id, idempotency_key)
+    ALGORITHM = INPLACE LOCK = NONE;
+
+CREATE UNIQUE INDEX ix_coins_srcref
+    ON coins_ledger (user_id, source, ref_id)
+    ALGORITHM = INPLACE LOCK = NONE;
@@ -0,0 +1,16 @@
+-- 005: 金幣餘額快照表（get_coins_balance 改成 PK 查詢）
+-- 可重複執行：部署新版 ledger 程式後再跑一次，會以帳本重算覆蓋餘額，修正期間的漂移。
+-- 回填期間須暫停金幣帳本寫入（或在無流量時段執行），否則 SUM 與並行寫入之間仍可能不一致。
+USE chicken_db;
+
+CREATE TABLE IF NOT EXISTS user_coin_balances (
+    user_id INT NOT NULL PRIMARY KEY,
+    balance BIGINT NOT NULL DEFAULT 0,
+    CONSTRAINT fk_user_coin_balances_user
+        FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+
+-- 用既有帳本回填（已存在的列以帳本總和覆蓋）
+INSERT INTO user_coin_balances (user_id, balance)
+SELECT user_id, SUM(delta) FROM coins_ledger GROUP BY user_id
+ON DUPLICATE KEY UPDATE balance = VALUES(balance);
@@ -0,0 +1,7 @@
+-- 006: refresh_tokens (user_id, expires_at) 複合索引（RT GC / 依 user 撤銷）
+-- expires_at 單欄索引已存在（model 上 index=True）
+USE chicken_db;
+
+CREATE INDEX ix_refresh_tokens_user_expires
+    ON refresh_tokens (user_id, expires_at)
+    ALGORITHM = INPLACE LOCK = NONE;
@@ -0,0 +1,6 @@
+-- 007: refresh_tokens.revoked_at 索引（RT GC 清理已撤銷的 RT）
+USE chicken_db;
+
+CREATE INDEX ix_refresh_tokens_revoked_at
+    ON refresh_tokens (revoked_at)
+    ALGORITHM = INPLACE LOCK = NONE;
@@ -2,6 +2,7 @@ USE chicken_db;
 SET FOREIGN_KEY_CHECKS = 0;
 
 TRUNCATE TABLE `coins_ledger`;
+TRUNCATE TABLE `user_coin_balances`;
 TRUNCATE TABLE `checkins`;
 TRUNCATE TABLE `runs`;
 TRUNCATE TABLE `refresh_tokens`;